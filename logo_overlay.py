@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image
 
+_LANCZOS = Image.Resampling.LANCZOS
+_ALPHA_LUT_CACHE: dict[int, list[int]] = {}
+_DROP_UNDERSCORE = str.maketrans("", "", "_")
 
+
+@lru_cache(maxsize=256)
 def _normalize_name(name: str) -> str:
-    stem = Path(name).stem
-    return "".join(ch for ch in stem.lower() if ch != "_")
+    return Path(name).stem.lower().translate(_DROP_UNDERSCORE)
 
 
 def _available_png_names(logo_dir: str) -> list[str]:
-    root = Path(logo_dir)
-    return sorted(p.name for p in root.glob("*.png") if p.is_file())
+    # DirEntry.is_file() reuses the type from the directory read instead of a stat per file.
+    try:
+        with os.scandir(logo_dir) as it:
+            return sorted(e.name for e in it if e.name.lower().endswith(".png") and e.is_file())
+    except FileNotFoundError:
+        return []
 
 
 def _resolve_with_fuzzy_match(logo_dir: str, expected_name: str) -> str | None:
@@ -71,24 +81,42 @@ def resolve_logo_path(
     return _resolve_with_fuzzy_match(logo_dir, selected_name)
 
 
-def _load_png_rgba(path: str | None) -> Image.Image | None:
+def _resize_to_height(img: Image.Image, target_h: int) -> Image.Image:
+    target_h = max(1, target_h)
+    scale = target_h / img.height
+    target_w = max(1, int(round(img.width * scale)))
+    return img.resize((target_w, target_h), _LANCZOS)
+
+
+@lru_cache(maxsize=16)
+def _decode_png_rgba_at_height(path: str, mtime_ns: int, target_h: int) -> Image.Image:
+    # mtime_ns is part of the cache key so an edited logo is decoded again.
+    # Only the resized logo is kept; the full-resolution decode is dropped after resizing.
+    with Image.open(path) as img:
+        return _resize_to_height(img.convert("RGBA"), target_h)
+
+
+def _load_png_rgba(path: str | None, target_h: int) -> Image.Image | None:
     if not path:
         return None
 
-    p = Path(path)
-    if not p.exists():
+    try:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except OSError:
         print(f"[WARN] logo 文件不存在: {path}")
         return None
 
-    with Image.open(p) as img:
-        return img.convert("RGBA")
+    # Callers rewrite the alpha channel, so never hand out the cached instance.
+    return _decode_png_rgba_at_height(str(path), mtime_ns, max(1, target_h)).copy()
 
 
-def _resize_to_height(img: Image.Image, target_h: int) -> Image.Image:
-    target_h = max(1, target_h)
-    scale = target_h / img.height
-    target_w = max(1, int(round(img.width * scale)))
-    return img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+def _alpha_lut(opacity: float) -> list[int]:
+    key = int(round(opacity * 1024))
+    lut = _ALPHA_LUT_CACHE.get(key)
+    if lut is None:
+        lut = [min(255, int(a * opacity)) for a in range(256)]
+        _ALPHA_LUT_CACHE[key] = lut
+    return lut
 
 
 def apply_single_logo_bottom_center(
@@ -99,16 +127,17 @@ def apply_single_logo_bottom_center(
     opacity: float,
     bottom_band_cfg: dict[str, float],
 ) -> Image.Image:
-    logo = _load_png_rgba(logo_path)
-    if logo is None:
-        return composed.convert("RGBA")
+    if opacity <= 0:
+        return composed
 
     w, h = composed.size
     short = min(w, h)
     margin = int(round(short * margin_ratio))
     target_h = max(1, int(round(short * scale_ratio)))
 
-    logo = _resize_to_height(logo, target_h)
+    logo = _load_png_rgba(logo_path, target_h)
+    if logo is None:
+        return composed
     logo_w, logo_h = logo.size
 
     top_ratio = float(bottom_band_cfg.get("top_ratio", 0.78))
@@ -128,9 +157,11 @@ def apply_single_logo_bottom_center(
     y = min(y, h - margin - logo_h)
     x = max(margin, min(x, w - margin - logo_w))
 
-    logo_alpha = logo.split()[-1].point(lambda a: int(a * opacity))
-    logo.putalpha(logo_alpha)
+    if opacity < 0.999:
+        logo_alpha = logo.getchannel("A").point(_alpha_lut(opacity))
+        logo.putalpha(logo_alpha)
 
-    composed_rgba = composed.convert("RGBA")
-    composed_rgba.alpha_composite(logo, (x, y))
-    return composed_rgba
+    # paste() with the logo as its own mask does the "over" blend in the caller's mode,
+    # avoiding an RGBA round-trip of the whole canvas.
+    composed.paste(logo, (x, y), logo)
+    return composed
@@ -4,36 +4,51 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import io
 import json
+import logging
 import math
+import os
 import shutil
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterable, Iterator
 
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+import PIL
+from PIL import Image, ImageFilter, ImageOps
 
 from logo_overlay import apply_single_logo_bottom_center, resolve_logo_path
 from logo_settings import AUTO_SCAN, BOTTOM_BAND, LOGO_DIR, LOGO_ID, LOGO_LIST, MARGIN_RATIO, OPACITY, SCALE_RATIO
 
+logger = logging.getLogger(__name__)
+
 MIN_SAFE_KEEP_RATIO = 0.60
 GOLDEN_RATIO = 1.618
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+EXIF_ORIENTATION_TAG = 0x0112
+JPEG_SUBSAMPLING = {"4:4:4": 0, "4:2:2": 1, "4:2:0": 2}
+_LANCZOS = Image.Resampling.LANCZOS
+_BILINEAR = Image.Resampling.BILINEAR
+# ProcessPoolExecutor rejects max_workers above 61 on Windows (WaitForMultipleObjects limit).
+_WINDOWS_MAX_WORKERS = 61
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Canvas:
     width: int
     height: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Foreground:
     paper_scale_mode: str
     paper_scale_override: float | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SafeCrop:
     left: float
     right: float
@@ -41,7 +56,7 @@ class SafeCrop:
     bottom: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Background:
     safe_crop: SafeCrop
     extra_scale: float
@@ -49,7 +64,7 @@ class Background:
     saturation: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Sharpen:
     enabled: bool
     target: str
@@ -60,14 +75,14 @@ class Sharpen:
 
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BottomBand:
     top_ratio: float
     bottom_ratio: float
     y_bias: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LogoConfig:
     enabled: bool
     placement: str
@@ -84,7 +99,7 @@ class LogoConfig:
     model_path: str | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     inbox_dir: Path
     out_dir: Path
@@ -97,8 +112,11 @@ class Config:
     sharpen: Sharpen
     logo: LogoConfig
     jpeg_quality: int
+    jpeg_optimize: bool
+    jpeg_progressive: bool
+    jpeg_subsampling: str
     move_processed_to_done: bool
-    supported_extensions: tuple[str, ...]
+    supported_extensions: frozenset[str]
 
 
 def parse_args() -> argparse.Namespace:
@@ -106,6 +124,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--config", default="config.json", help="配置文件路径（默认: config.json）")
     parser.add_argument("--dry-run", action="store_true", help="仅打印将要处理的文件，不实际写出/移动")
     parser.add_argument("--once", action="store_true", help="单次运行后退出（为兼容自动化流程保留该参数）")
+    parser.add_argument("--jobs", type=int, default=0, help="并行处理进程数（默认 0 = CPU 核心数，1 = 串行）")
+    parser.add_argument("--verbose", action="store_true", help="逐张打印处理/输出/移动信息（--dry-run 时自动开启）")
     return parser.parse_args()
 
 
@@ -195,9 +215,13 @@ def load_config(path: Path) -> Config:
             sharpen=sharpen,
             logo=logo,
             jpeg_quality=int(raw.get("jpeg_quality", 92)),
+            jpeg_optimize=bool(raw.get("jpeg_optimize", False)),
+            jpeg_progressive=bool(raw.get("jpeg_progressive", False)),
+            jpeg_subsampling=str(raw.get("jpeg_subsampling", "4:2:0")),
             move_processed_to_done=bool(raw.get("move_processed_to_done", True)),
-            supported_extensions=tuple(
-                ext.lower() for ext in raw.get("supported_extensions", [".jpg", ".jpeg", ".png", ".webp"])
+            supported_extensions=frozenset(
+                "." + str(ext).lower().lstrip(".")
+                for ext in raw.get("supported_extensions", [".jpg", ".jpeg", ".png", ".webp"])
             ),
         )
     except (AttributeError, IndexError, KeyError, TypeError, ValueError) as exc:
@@ -234,6 +258,8 @@ def validate_config(config: Config) -> None:
         raise ValueError("background.bg_extra_scale 不能小于 1.0")
     if config.jpeg_quality < 1 or config.jpeg_quality > 100:
         raise ValueError("jpeg_quality 必须在 1~100 范围内")
+    if config.jpeg_subsampling not in JPEG_SUBSAMPLING:
+        raise ValueError("jpeg_subsampling 仅支持 4:4:4、4:2:2、4:2:0")
     if config.sharpen.target not in {"foreground", "all"}:
         raise ValueError("sharpen_target 仅支持 foreground 或 all")
     if config.sharpen.radius < 0 or config.sharpen.percent < 0 or config.sharpen.threshold < 0:
@@ -257,25 +283,43 @@ def validate_config(config: Config) -> None:
         raise ValueError("logo.library 的 key 不能为空")
 
 
-def iter_images(inbox: Path, exts: tuple[str, ...]) -> Iterable[Path]:
+def iter_images(inbox: Path, exts: frozenset[str]) -> Iterable[Path]:
+    """List supported images in ``inbox``; ``exts`` are lowercase suffixes with a leading dot."""
     if not inbox.exists():
         return []
-    allowed = {ext.lower() for ext in exts}
-    return sorted(p for p in inbox.iterdir() if p.is_file() and p.suffix.lower() in allowed)
-
-
-def resize_cover(img: Image.Image, target_size: tuple[int, int]) -> Image.Image:
+    with os.scandir(inbox) as it:
+        entries = [e for e in it if os.path.splitext(e.name)[1].lower() in exts and e.is_file()]
+    entries.sort(key=lambda e: e.name)
+    return [Path(e.path) for e in entries]
+
+
+def resize_cover(
+    img: Image.Image,
+    target_size: tuple[int, int],
+    resample: Image.Resampling = _LANCZOS,
+    within: tuple[int, int, int, int] | None = None,
+) -> Image.Image:
+    """Scale to cover ``target_size`` and centre-crop, as a single resample via ``box=``.
+
+    ``within`` restricts the source to a sub-rectangle.
+    """
     tw, th = target_size
-    scale = max(tw / img.width, th / img.height)
-    new_size = (max(1, int(round(img.width * scale))), max(1, int(round(img.height * scale))))
-    resized = img.resize(new_size, Image.Resampling.LANCZOS)
-    left = (resized.width - tw) // 2
-    top = (resized.height - th) // 2
-    return resized.crop((left, top, left + tw, top + th))
+    left, top, right, bottom = within or (0, 0, img.width, img.height)
+    src_w = right - left
+    src_h = bottom - top
+    scale = max(tw / src_w, th / src_h)
+    box_w = tw / scale
+    box_h = th / scale
+    x0 = left + (src_w - box_w) / 2
+    y0 = top + (src_h - box_h) / 2
+    return img.resize(target_size, resample, box=(x0, y0, x0 + box_w, y0 + box_h))
 
 
 def resize_contain(img: Image.Image, max_size: tuple[int, int]) -> Image.Image:
-    return ImageOps.contain(img, max_size, method=Image.Resampling.LANCZOS)
+    mw, mh = max_size
+    scale = min(mw / img.width, mh / img.height)
+    new_size = (max(1, int(round(img.width * scale))), max(1, int(round(img.height * scale))))
+    return img.resize(new_size, _LANCZOS)
 
 
 def _clamp_non_symmetric_crop(crop: SafeCrop) -> SafeCrop:
@@ -284,6 +328,10 @@ def _clamp_non_symmetric_crop(crop: SafeCrop) -> SafeCrop:
     lr_total = crop.left + crop.right
     tb_total = crop.top + crop.bottom
 
+    if lr_total <= max_pair_crop and tb_total <= max_pair_crop:
+        # Always true for a config that passed validate_config.
+        return crop
+
     if lr_total > max_pair_crop and lr_total > 0:
         scale = max_pair_crop / lr_total
         left = crop.left * scale
@@ -303,9 +351,10 @@ def _clamp_non_symmetric_crop(crop: SafeCrop) -> SafeCrop:
     return SafeCrop(left=left, right=right, top=top, bottom=bottom)
 
 
-def apply_safe_crop(img: Image.Image, crop: SafeCrop) -> Image.Image:
-    """Apply non-symmetric crop; fallback to safe minimum keep ratio if too aggressive."""
+def safe_crop_box(img: Image.Image, crop: SafeCrop) -> tuple[int, int, int, int]:
+    """Pixel box of the non-symmetric crop; the whole image if the crop is too aggressive."""
     safe_crop = _clamp_non_symmetric_crop(crop)
+    full = (0, 0, img.width, img.height)
 
     left = int(round(img.width * safe_crop.left))
     right = img.width - int(round(img.width * safe_crop.right))
@@ -318,9 +367,9 @@ def apply_safe_crop(img: Image.Image, crop: SafeCrop) -> Image.Image:
     min_h = max(1, int(math.floor(img.height * MIN_SAFE_KEEP_RATIO)))
 
     if cropped_w < min_w or cropped_h < min_h or cropped_w < 1 or cropped_h < 1:
-        return img
+        return full
 
-    return img.crop((left, top, right, bottom))
+    return (left, top, right, bottom)
 
 
 def get_paper_scale_ratio(cfg: Config) -> float:
@@ -331,33 +380,120 @@ def get_paper_scale_ratio(cfg: Config) -> float:
     return 0.78
 
 
+def get_source_budget(cfg: Config) -> tuple[int, int]:
+    """Smallest upright source size that feeds the background cover resize without upscaling.
+
+    The foreground is always contained within the canvas, so the background dominates.
+    """
+    crop = _clamp_non_symmetric_crop(cfg.background.safe_crop)
+    keep_w = 1.0 - crop.left - crop.right
+    keep_h = 1.0 - crop.top - crop.bottom
+    return (
+        int(math.ceil(cfg.canvas.width / keep_w)),
+        int(math.ceil(cfg.canvas.height / keep_h)),
+    )
+
+
+def _is_exif_rotated(src: Image.Image) -> bool:
+    return src.getexif().get(EXIF_ORIENTATION_TAG) in {5, 6, 7, 8}
+
+
+def draft_for_canvas(src: Image.Image, cfg: Config) -> None:
+    """Let libjpeg decode JPEGs at 1/2, 1/4 or 1/8 scale when still above the source budget."""
+    # Camera JPEGs with an embedded preview (MPF/APP2) open as MPO, a JpegImageFile subclass.
+    if src.format not in {"JPEG", "MPO"}:
+        return
+    need_w, need_h = get_source_budget(cfg)
+    if _is_exif_rotated(src):
+        need_w, need_h = need_h, need_w
+    src.draft("RGB", (need_w, need_h))
+
+
+def reduce_to_budget(img: Image.Image, cfg: Config, rotated: bool = False) -> Image.Image:
+    """Box-reduce by the largest integer factor that keeps the image above the source budget.
+
+    Foreground and background both only ever downsample from here, so they share one
+    cheap reduction instead of each running LANCZOS over the full-resolution scan.
+    ``rotated`` marks an image whose EXIF orientation has not been applied yet.
+    """
+    need_w, need_h = get_source_budget(cfg)
+    if rotated:
+        need_w, need_h = need_h, need_w
+    factor = min(img.width // need_w, img.height // need_h)
+    if factor < 2:
+        return img
+    return img.reduce(factor)
+
+
+def load_corrected(fp: str | Path | IO[bytes], cfg: Config) -> Image.Image:
+    """Open an image upright and in RGB, decoded no larger than the source budget needs."""
+    with Image.open(fp) as src:
+        draft_for_canvas(src, cfg)
+        # Shrink before exif_transpose so the transpose copy happens at budget size,
+        # not at full scan resolution. reduce() needs RGB: it would average palette indices.
+        img = src if src.mode == "RGB" else src.convert("RGB")
+        img = reduce_to_budget(img, cfg, rotated=_is_exif_rotated(src))
+        return ImageOps.exif_transpose(img)
+
+
+def _enhance_matrix(saturation: float, brightness: float) -> tuple[float, ...]:
+    """RGB->RGB matrix equal to ImageEnhance.Color followed by ImageEnhance.Brightness."""
+    rows: list[float] = []
+    for channel in range(3):
+        for source, weight in enumerate(LUMA_WEIGHTS):
+            own = saturation if source == channel else 0.0
+            rows.append(brightness * (own + (1.0 - saturation) * weight))
+        rows.append(0.0)
+    return tuple(rows)
+
+
 def build_background(corrected: Image.Image, cfg: Config) -> Image.Image:
     canvas_size = (cfg.canvas.width, cfg.canvas.height)
-    bg_src = apply_safe_crop(corrected, cfg.background.safe_crop)
 
-    scaled_target = (
-        int(round(cfg.canvas.width * cfg.background.extra_scale)),
-        int(round(cfg.canvas.height * cfg.background.extra_scale)),
+    # Safe crop and cover fit collapse into one resample box: no cropped copy of the source
+    # and no (canvas * extra_scale) intermediate. That intermediate was only ever cover-fit
+    # back down to the canvas, so bg_extra_scale never changed the framing.
+    # The background is dimmed, desaturated and mostly hidden behind the foreground, so
+    # LANCZOS detail is wasted here; Pillow's BILINEAR still antialiases when downscaling.
+    bg = resize_cover(
+        corrected,
+        canvas_size,
+        resample=_BILINEAR,
+        within=safe_crop_box(corrected, cfg.background.safe_crop),
     )
-    scaled_cover = resize_cover(bg_src, scaled_target)
-    bg = resize_cover(scaled_cover, canvas_size)
 
-    bg = ImageEnhance.Color(bg).enhance(cfg.background.saturation)
-    bg = ImageEnhance.Brightness(bg).enhance(cfg.background.brightness)
-    return bg
+    if cfg.background.saturation == 1.0 and cfg.background.brightness == 1.0:
+        return bg
+
+    # Color + Brightness are both linear per pixel; one matrix pass replaces two blends.
+    return bg.convert("RGB", _enhance_matrix(cfg.background.saturation, cfg.background.brightness))
+
+
+@functools.lru_cache(maxsize=8)
+def _unsharp_filter(sharpen: Sharpen) -> ImageFilter.UnsharpMask:
+    # Sharpen is frozen, so one filter object serves every image in the batch.
+    return ImageFilter.UnsharpMask(
+        radius=sharpen.radius,
+        percent=sharpen.percent,
+        threshold=sharpen.threshold,
+    )
 
 
 def apply_unsharp(img: Image.Image, sharpen: Sharpen) -> Image.Image:
-    return img.filter(
-        ImageFilter.UnsharpMask(
-            radius=sharpen.radius,
-            percent=sharpen.percent,
-            threshold=sharpen.threshold,
-        )
+    return img.filter(_unsharp_filter(sharpen))
+
+
+def resolve_default_logo_path() -> str | None:
+    return resolve_logo_path(
+        logo_id=LOGO_ID,
+        logo_dir=LOGO_DIR,
+        logo_list=LOGO_LIST,
+        auto_scan=AUTO_SCAN,
     )
 
 
 def render_polaroid(corrected: Image.Image, cfg: Config, selected_logo_path: str | None = None) -> Image.Image:
+    corrected = reduce_to_budget(corrected, cfg)
     bg = build_background(corrected, cfg)
 
     paper_ratio = get_paper_scale_ratio(cfg)
@@ -368,7 +504,8 @@ def render_polaroid(corrected: Image.Image, cfg: Config, selected_logo_path: str
     if cfg.sharpen.enabled and cfg.sharpen.target in {"foreground", "all"}:
         fg = apply_unsharp(fg, cfg.sharpen)
 
-    composed = bg.copy()
+    # build_background returns a fresh buffer that nothing else holds; paste into it directly.
+    composed = bg
     x = (cfg.canvas.width - fg.width) // 2
     y = (cfg.canvas.height - fg.height) // 2
     composed.paste(fg, (x, y))
@@ -377,12 +514,7 @@ def render_polaroid(corrected: Image.Image, cfg: Config, selected_logo_path: str
         composed = apply_unsharp(composed, cfg.sharpen)
 
     if selected_logo_path is None:
-        selected_logo_path = resolve_logo_path(
-            logo_id=LOGO_ID,
-            logo_dir=LOGO_DIR,
-            logo_list=LOGO_LIST,
-            auto_scan=AUTO_SCAN,
-        )
+        selected_logo_path = resolve_default_logo_path()
     if selected_logo_path:
         composed = apply_single_logo_bottom_center(
             composed=composed,
@@ -392,37 +524,151 @@ def render_polaroid(corrected: Image.Image, cfg: Config, selected_logo_path: str
             opacity=OPACITY,
             bottom_band_cfg=BOTTOM_BAND,
         )
-    return composed.convert("RGB")
-
-
-def process_one(image_path: Path, cfg: Config, dry_run: bool = False) -> None:
+    # The logo is pasted in the canvas's own mode, so this is normally already RGB.
+    if composed.mode != "RGB":
+        composed = composed.convert("RGB")
+    return composed
+
+
+def render_one(
+    image_path: Path,
+    cfg: Config,
+    dry_run: bool = False,
+    logo_path: str | None = None,
+) -> tuple[Image.Image, Path] | None:
+    """Log and render one inbox image; returns (canvas, output path), or None on a dry run."""
     output_name = f"{image_path.stem}{cfg.output_suffix}.{cfg.output_extension}"
     output_path = cfg.out_dir / output_name
     done_path = cfg.done_dir / image_path.name
 
-    print(f"[INFO] 处理: {image_path.name}")
-    print(f"       输出: {output_path}")
-    if cfg.move_processed_to_done:
-        print(f"       移动原图: {done_path}")
+    if logger.isEnabledFor(logging.INFO):
+        lines = [f"[INFO] 处理: {image_path.name}", f"       输出: {output_path}"]
+        if cfg.move_processed_to_done:
+            lines.append(f"       移动原图: {done_path}")
+        logger.info("\n".join(lines))
 
     if dry_run:
+        return None
+
+    corrected = load_corrected(image_path, cfg)
+    return render_polaroid(corrected, cfg, selected_logo_path=logo_path), output_path
+
+
+def write_jpeg(composed: Image.Image, output_path: Path, cfg: Config) -> None:
+    # Encode in memory and write once: one write() instead of many small libjpeg flushes,
+    # and a failed encode never leaves a truncated file in out/.
+    buf = io.BytesIO()
+    composed.save(
+        buf,
+        format="JPEG",
+        quality=cfg.jpeg_quality,
+        optimize=cfg.jpeg_optimize,
+        progressive=cfg.jpeg_progressive,
+        subsampling=JPEG_SUBSAMPLING[cfg.jpeg_subsampling],
+    )
+    output_path.write_bytes(buf.getbuffer())
+
+
+def process_one(
+    image_path: Path,
+    cfg: Config,
+    dry_run: bool = False,
+    logo_path: str | None = None,
+    move_to_done: bool = True,
+) -> None:
+    rendered = render_one(image_path, cfg, dry_run=dry_run, logo_path=logo_path)
+    if rendered is None:
         return
 
-    with Image.open(image_path) as src:
-        corrected = ImageOps.exif_transpose(src).convert("RGB")
-        composed = render_polaroid(corrected, cfg)
-        composed.save(
-            output_path,
-            format="JPEG",
-            quality=cfg.jpeg_quality,
-            optimize=True,
-            progressive=True,
-        )
+    write_jpeg(*rendered, cfg)
+    if move_to_done and cfg.move_processed_to_done:
+        move_processed(image_path, cfg)
 
-    if cfg.move_processed_to_done:
+
+def move_processed(image_path: Path, cfg: Config) -> None:
+    done_path = cfg.done_dir / image_path.name
+    try:
+        # Single rename syscall when inbox/ and done/ share a filesystem (the usual layout).
+        os.replace(image_path, done_path)
+    except OSError:
         shutil.move(str(image_path), str(done_path))
 
 
+def describe_pillow_build() -> str:
+    # Pillow-SIMD releases carry a ".postN" suffix on the upstream version they track.
+    version = PIL.__version__
+    return f"Pillow-SIMD {version}" if ".post" in version else f"Pillow {version}（未启用 SIMD）"
+
+
+# Per-process batch settings, installed once by _init_worker instead of pickled per task.
+_worker_batch: tuple[Config, bool, str | None] | None = None
+
+
+def _configure_logging(level: int) -> None:
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+
+
+def _init_worker(cfg: Config, dry_run: bool, logo_path: str | None, log_level: int) -> None:
+    global _worker_batch
+    _worker_batch = (cfg, dry_run, logo_path)
+    # Spawned workers (Windows/macOS) do not inherit the parent's logging setup.
+    _configure_logging(log_level)
+
+
+def _process_one_safe(image_path: Path) -> tuple[Path, str | None]:
+    # Report failures as text so nothing unpicklable crosses back from a worker.
+    assert _worker_batch is not None
+    cfg, dry_run, logo_path = _worker_batch
+    try:
+        process_one(image_path, cfg, dry_run=dry_run, logo_path=logo_path, move_to_done=False)
+    except Exception as exc:  # noqa: BLE001
+        return image_path, str(exc)
+    return image_path, None
+
+
+def _settle(image_path: Path, future: Future[None]) -> tuple[Path, str | None]:
+    try:
+        future.result()
+    except Exception as exc:  # noqa: BLE001
+        return image_path, str(exc)
+    return image_path, None
+
+
+def _iter_pipelined(
+    images: list[Path],
+    cfg: Config,
+    dry_run: bool,
+    logo_path: str | None,
+) -> Iterator[tuple[Path, str | None]]:
+    """Serial path: JPEG-encode image N on a writer thread while image N+1 renders.
+
+    Pillow releases the GIL inside both the encoder and the resample/filter kernels,
+    so the two stages genuinely overlap. Results come back in input order.
+    """
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending: tuple[Path, Future[None]] | None = None
+        for image_path in images:
+            future: Future[None]
+            try:
+                rendered = render_one(image_path, cfg, dry_run=dry_run, logo_path=logo_path)
+            except Exception as exc:  # noqa: BLE001
+                future = Future()
+                future.set_exception(exc)
+            else:
+                if rendered is None:
+                    future = Future()
+                    future.set_result(None)
+                else:
+                    future = writer.submit(write_jpeg, *rendered, cfg)
+
+            if pending is not None:
+                yield _settle(*pending)
+            pending = (image_path, future)
+
+        if pending is not None:
+            yield _settle(*pending)
+
+
 def ensure_dirs(cfg: Config, dry_run: bool) -> None:
     dirs = [cfg.inbox_dir, cfg.out_dir]
     if cfg.move_processed_to_done:
@@ -437,9 +683,14 @@ def ensure_dirs(cfg: Config, dry_run: bool) -> None:
 
 def main() -> int:
     args = parse_args()
+    log_level = logging.INFO if args.verbose or args.dry_run else logging.WARNING
+    _configure_logging(log_level)
 
     try:
+        if args.jobs < 0:
+            raise ValueError("--jobs 不能为负数")
         cfg = load_config(Path(args.config))
+        logger.info("[INFO] 图像库: %s", describe_pillow_build())
         ensure_dirs(cfg, dry_run=args.dry_run)
 
         images = list(iter_images(cfg.inbox_dir, cfg.supported_extensions))
@@ -447,11 +698,37 @@ def main() -> int:
             print("No images found in inbox/")
             return 0
 
-        for img_path in images:
-            try:
-                process_one(img_path, cfg, dry_run=args.dry_run)
-            except Exception as exc:  # noqa: BLE001
-                print(f"[ERROR] 处理失败 {img_path.name}: {exc}", file=sys.stderr)
+        # Resolve the logo once per batch; "" tells render_polaroid that no logo was selected.
+        logo_path = resolve_default_logo_path() or ""
+
+        jobs = min(args.jobs or os.cpu_count() or 1, len(images))
+        if sys.platform == "win32":
+            jobs = min(jobs, _WINDOWS_MAX_WORKERS)
+        pool = None
+        if not args.dry_run and jobs > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(cfg, args.dry_run, logo_path, log_level),
+            )
+        try:
+            if pool is None:
+                results = _iter_pipelined(images, cfg, args.dry_run, logo_path)
+            else:
+                results = pool.map(_process_one_safe, images)
+            for img_path, error in results:
+                if error is not None:
+                    print(f"[ERROR] 处理失败 {img_path.name}: {error}", file=sys.stderr)
+                    continue
+                # Originals move only after their output was written, and only from this process.
+                if cfg.move_processed_to_done and not args.dry_run:
+                    try:
+                        move_processed(img_path, cfg)
+                    except OSError as exc:
+                        print(f"[ERROR] 移动原图失败 {img_path.name}: {exc}", file=sys.stderr)
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         if args.once:
             print("[INFO] 已完成单次处理（--once）。")
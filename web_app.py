@@ -7,9 +7,8 @@ import io
 from pathlib import Path
 
 import streamlit as st
-from PIL import Image, ImageOps
 
-from polaroid import load_config, render_polaroid
+from polaroid import load_config, load_corrected, render_polaroid
 
 st.set_page_config(page_title="Polaroid Formatter", page_icon="📸", layout="wide")
 
@@ -33,8 +32,7 @@ if uploaded is None:
     st.info("请先上传一张图片。")
     st.stop()
 
-src = Image.open(uploaded)
-corrected = ImageOps.exif_transpose(src).convert("RGB")
+corrected = load_corrected(uploaded, cfg)
 result = render_polaroid(corrected, cfg)
 
 left, right = st.columns(2)